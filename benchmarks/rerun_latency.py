@@ -0,0 +1,157 @@
+"""Measure how long a widget change takes to rerun under concurrent sessions.
+
+Starts the app with ``streamlit run`` and opens many browser-less sessions
+over Streamlit's websocket protocol. Each session moves the "Creativity
+Level" slider repeatedly and times the rerun until the server reports
+``script_finished``. Run it against an older revision of the page to
+compare, e.g.::
+
+    python benchmarks/rerun_latency.py --sessions 50 --changes 20
+    git show <rev>:genai_studio.py > old_studio.py
+    python benchmarks/rerun_latency.py --app old_studio.py --sessions 50 --changes 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import AsyncExitStack
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.asyncio.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLIDER_LABEL = "Creativity Level"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port):
+    env = {**os.environ, "IBM_API_KEY": "benchmark-key"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false",
+         "--server.fileWatcherType", "none"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Streamlit server did not start")
+
+
+async def run_until_finished(ws, back_msg, slider=None):
+    """Send a rerun request; return (elapsed seconds, bytes received)"""
+    start = time.perf_counter()
+    await ws.send(back_msg.SerializeToString())
+    received = 0
+    while True:
+        data = await ws.recv()
+        received += len(data)
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        if slider is not None and msg.WhichOneof("type") == "delta":
+            element = msg.delta.new_element
+            if element.WhichOneof("type") == "slider" and element.slider.label == SLIDER_LABEL:
+                slider["id"] = element.slider.id
+                slider["fragment_id"] = msg.delta.fragment_id
+                slider["value"] = list(element.slider.default)
+        if msg.WhichOneof("type") == "script_finished":
+            return time.perf_counter() - start, received
+
+
+async def open_session(stack, port):
+    """Connect, run the page once and locate the slider"""
+    ws = await stack.enter_async_context(
+        connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None)
+    )
+    initial = BackMsg()
+    initial.rerun_script.SetInParent()
+    slider = {}
+    await run_until_finished(ws, initial, slider)
+    if "id" not in slider:
+        raise RuntimeError(f"Slider '{SLIDER_LABEL}' not found on the page")
+    return ws, slider
+
+
+async def move_slider(ws, slider, changes):
+    timings, sizes = [], []
+    for change in range(changes):
+        msg = BackMsg()
+        widget = msg.rerun_script.widget_states.widgets.add()
+        widget.id = slider["id"]
+        widget.double_array_value.data.append(0.1 * (1 + change % 10))
+        # The browser sends the fragment id when the widget lives in a fragment
+        msg.rerun_script.fragment_id = slider["fragment_id"]
+        elapsed, received = await run_until_finished(ws, msg)
+        timings.append(elapsed)
+        sizes.append(received)
+    return timings, sizes
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process, or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def benchmark(server, port, sessions, changes):
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(*(open_session(stack, port) for _ in range(sessions)))
+        cpu_before = cpu_seconds(server.pid)
+        results = await asyncio.gather(*(move_slider(ws, slider, changes) for ws, slider in opened))
+        cpu_after = cpu_seconds(server.pid)
+
+    timings = [t for result in results for t in result[0]]
+    sizes = [s for result in results for s in result[1]]
+    cpu = None if cpu_before is None else (cpu_after - cpu_before) / len(timings)
+    return timings, sizes, cpu, bool(opened[0][1]["fragment_id"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="genai_studio.py", help="Page script, relative to the repository root")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions")
+    parser.add_argument("--changes", type=int, default=10, help="Slider changes per session")
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    server = start_server(args.app, port)
+    try:
+        timings, sizes, cpu, fragment = asyncio.run(benchmark(server, port, args.sessions, args.changes))
+    finally:
+        server.terminate()
+        server.wait()
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(f"app:              {args.app}")
+    print(f"rerun scope:      {'fragment' if fragment else 'full page'}")
+    print(f"sessions:         {args.sessions} x {args.changes} slider changes")
+    print(f"rerun latency:    median {statistics.median(timings_ms):.1f} ms, p95 {p95:.1f} ms, max {timings_ms[-1]:.1f} ms")
+    print(f"bytes per rerun:  {statistics.mean(sizes):.0f}")
+    if cpu is not None:
+        print(f"server CPU/rerun: {cpu * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import copy
+import threading
+
+# -------------------------------
+# Single-Flight Request Coalescing
+# -------------------------------
+class _Call:
+    """One in-flight upstream call shared by every caller with the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.completed = False
+
+
+def _copy_error(error):
+    """A fresh exception of the same type and message, without a traceback"""
+    try:
+        clone = copy.copy(error)
+    except Exception:
+        clone = None
+    if type(clone) is not type(error) or clone is error:
+        clone = RuntimeError(f"Coalesced call failed: {error!r}")
+    clone.__traceback__ = None
+    return clone
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait and receive the same result, or
+    a copy of the same exception. Nothing is kept once the call finishes, so this is
+    coalescing rather than caching.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._upstream_calls = 0
+        self._coalesced_calls = 0
+
+    def do(self, key, fn):
+        """Run fn() for key, or wait for the call already in flight.
+
+        fn runs in the leader's thread only, so it must not call st.*:
+        Streamlit's rerun/stop exceptions belong to the leader's session.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced_calls += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._upstream_calls += 1
+                leader = True
+
+        if leader:
+            try:
+                call.result = fn()
+                call.completed = True
+            except Exception as e:
+                call.error = e
+                call.completed = True
+                raise
+            finally:
+                # BaseExceptions (Streamlit control flow, KeyboardInterrupt,
+                # SystemExit) propagate in the leader only; waiters retry.
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+            if not call.completed:
+                with self._lock:
+                    self._coalesced_calls -= 1
+                return self.do(key, fn)
+
+            if call.error is not None:
+                # Each waiter raises its own copy; raising the shared object
+                # from several threads would merge their tracebacks.
+                raise _copy_error(call.error) from call.error
+        return call.result
+
+    def stats(self):
+        """Return counters describing how many upstream calls were saved"""
+        with self._lock:
+            total = self._upstream_calls + self._coalesced_calls
+            return {
+                "requests": total,
+                "upstream_calls": self._upstream_calls,
+                "calls_saved": self._coalesced_calls,
+                "in_flight": len(self._calls),
+                "saved_ratio": self._coalesced_calls / total if total else 0.0,
+            }
@@ -0,0 +1,169 @@
+# -------------------------------
+# Static Page Content
+# -------------------------------
+# Imported once per server process, so none of this is rebuilt on reruns.
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1 style="margin: 0; font-size: 3rem; font-weight: 300;">GenAI Story Generator</h1>
+    <p style="margin: 0.5rem 0 0 0; font-size: 1.2rem; opacity: 0.9;">by Abi Karimireddy</p>
+</div>
+"""
+
+# Official IBM Watson models available in us-south region (as of Jan 2025)
+MODEL_OPTIONS = {
+    # IBM Granite 3.3 Series (Latest - Most Recommended)
+    "🔥 IBM Granite 3.3 8B Instruct": "ibm/granite-3-3-8b-instruct",
+    
+    # IBM Granite 3 Series (Very Recent - Highly Recommended)
+    "⭐ IBM Granite 3 8B Instruct": "ibm/granite-3-8b-instruct",
+    "⭐ IBM Granite 3 2B Instruct": "ibm/granite-3-2b-instruct",
+    "IBM Granite 3.2 8B Instruct": "ibm/granite-3-2-8b-instruct",
+    
+    # IBM Granite Legacy (Proven & Reliable)
+    "IBM Granite 13B Instruct v2": "ibm/granite-13b-instruct-v2",
+    
+    # IBM Granite Code Models (Great for structured stories)
+    "IBM Granite 8B Code Instruct": "ibm/granite-8b-code-instruct",
+    "IBM Granite 20B Code Instruct": "ibm/granite-20b-code-instruct",
+    "IBM Granite 34B Code Instruct": "ibm/granite-34b-code-instruct",
+    
+    # Meta Llama 4 Series (Latest - Excellent for Creative Writing)
+    "🚀 Llama 4 Maverick 17B": "meta-llama/llama-4-maverick-17b-128e-instruct-fp8",
+    "🚀 Llama 4 Scout 17B": "meta-llama/llama-4-scout-17b-16e-instruct",
+    
+    # Meta Llama 3.3 Series (Latest Stable)
+    "🔥 Llama 3.3 70B Instruct": "meta-llama/llama-3-3-70b-instruct",
+    
+    # Meta Llama 3.2 Series (Multimodal Capabilities)
+    "Llama 3.2 3B Instruct": "meta-llama/llama-3-2-3b-instruct",
+    "Llama 3.2 1B Instruct": "meta-llama/llama-3-2-1b-instruct",
+    
+    # Meta Llama 3.1 Series (Proven Performance)
+    "Llama 3.1 70B Instruct": "meta-llama/llama-3-1-70b-instruct",
+    "Llama 3.1 8B Instruct": "meta-llama/llama-3-1-8b-instruct",
+    "Llama 3.1 405B Instruct": "meta-llama/llama-3-405b-instruct",
+    
+    # Meta Llama 2 Series (Still Supported)
+    "Llama 2 13B Chat": "meta-llama/llama-2-13b-chat",
+    
+    # Mistral Models (Creative & Multilingual)
+    "🌟 Mistral Large": "mistralai/mistral-large",
+    "Mistral Medium 2505": "mistralai/mistral-medium-2505",
+    "Mistral Small 24B": "mistralai/mistral-small-24b-instruct-2501",
+    "Mixtral 8x7B Instruct": "mistralai/mixtral-8x7b-instruct-v01",
+    
+    # Google Models (Instruction Following)
+    "Google Flan-T5 XXL": "google/flan-t5-xxl",
+    "Google Flan-T5 XL": "google/flan-t5-xl",
+    "Google Flan-UL2": "google/flan-ul2",
+    
+    # Specialized Models
+    "ALLaM 13B Instruct (Arabic)": "sdaia/allam-1-13b-instruct",
+    "JAIS 13B Chat (Arabic)": "core42/jais-13b-chat",
+    "ELYZA Japanese Llama2": "elyza/elyza-japanese-llama-2-7b-instruct",
+    
+    # BigScience Models
+    "MT0-XXL 13B (Multilingual)": "bigscience/mt0-xxl"
+}
+
+# Info box shown under the model picker, by model family
+MODEL_FAMILY_INFO = {
+    "granite": """
+<div class="info-box">
+    <small><strong>IBM Granite Models:</strong> Highly reliable, great for structured stories and consistent output. Recommended for most users.</small>
+</div>
+""",
+    "llama": """
+<div class="info-box">
+    <small><strong>Llama Models:</strong> Excellent for creative writing and dialogue. May require more specific prompting.</small>
+</div>
+""",
+}
+
+# Story option lists
+SETTINGS = ["Modern City", "Small Town", "Fantasy Realm", "Space Station", "Medieval Castle", "Haunted House", "Desert Island", "Underground Bunker", "Forest", "Other"]
+MOODS = ["Dark & Mysterious", "Light & Hopeful", "Intense & Thrilling", "Melancholic", "Humorous", "Romantic", "Eerie", "Inspirational"]
+GENRES = ["Suspense", "Adventure", "Fantasy", "Drama", "Mystery", "Horror"]
+WRITING_STYLES = ["Narrative", "Descriptive", "Dialogue-Heavy", "Action-Packed", "Literary", "Cinematic"]
+
+# Map length to tokens
+LENGTH_TOKENS = {
+    "Short (300-500 words)": 600,
+    "Medium (500-800 words)": 1000,
+    "Long (800-1200 words)": 1500
+}
+
+API_SETUP_WARNING_HTML = """
+<div class="warning-box">
+    <strong>⚠ API Setup Required</strong><br>
+    Please set your IBM Watson API credentials as environment variables:
+    <ul>
+        <li>IBM_API_KEY</li>
+        <li>IBM_PROJECT_ID</li>
+        <li>IBM_REGION (us-south, eu-gb, jp-tok, etc.)</li>
+    </ul>
+</div>
+"""
+
+MODEL_TROUBLESHOOTING_HTML = """
+<div class="warning-box">
+    <strong>💡 Troubleshooting Tips:</strong><br>
+    • Try a different model (IBM Granite models are most reliable)<br>
+    • Check if your region supports the selected model<br>
+    • Verify your IBM Watson project has access to foundation models
+</div>
+"""
+
+STORY_TIPS_MD = """
+**For Better Stories:**
+- Provide detailed context about what happened to your character
+- Be specific about the setting and time period
+- Include emotional elements or conflicts in your context
+- Mention any specific themes you want explored
+- Try different creativity levels to find your preferred style
+
+**Genre Tips:**
+- **Suspense**: Focus on what's at stake and create uncertainty
+- **Adventure**: Describe the quest or journey your character must undertake
+- **Fantasy**: Establish magical elements or otherworldly settings
+- **Drama**: Emphasize emotional conflicts and relationships
+- **Mystery**: Present a puzzle or crime that needs solving
+- **Horror**: Create atmosphere with fear-inducing elements
+"""
+
+MODEL_INFO_MD = """
+**Recommended Models:**
+- **IBM Granite 13B Chat/Instruct**: Most reliable, great for all story types
+- **Meta Llama 2 70B Chat**: Excellent creativity and dialogue
+- **Mistral 7B Instruct**: Good balance of creativity and coherence
+
+**Common Issues:**
+- **404 Model Error**: Model not available in your region - try IBM Granite models
+- **Repetitive text**: Increase repetition penalty or try a different model
+- **Story too short**: Increase max tokens or provide more detailed context
+- **Authentication errors**: Check your IBM Watson API credentials
+
+**Regional Availability:**
+- US-South: Most models available
+- EU-GB: Limited model selection
+- JP-TOK: Check model availability in Watson Studio
+"""
+
+MODEL_COMPARISON_MD = """
+| Model | Best For | Creativity | Reliability | Speed |
+|-------|----------|------------|-------------|-------|
+| IBM Granite 13B | Structured stories, consistency | Medium | High | Fast |
+| Meta Llama 2 70B | Creative writing, dialogue | High | High | Medium |
+| Mistral 7B | Balanced performance | Medium | Medium | Fast |
+| Code Llama 34B | Technical/structured content | Medium | Medium | Medium |
+
+💡 **Tip**: Start with IBM Granite models for best compatibility!
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <p>Powered by IBM WatsonX AI | Created with Streamlit | Enhanced Story Generation v3.0</p>
+    <p>💡 Tip: Try different models if one doesn't work - availability varies by region!</p>
+</div>
+"""
@@ -0,0 +1,293 @@
+import json
+import logging
+import os
+import re
+
+import requests
+
+from coalescing import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# API Configuration
+# -------------------------------
+def get_api_credentials():
+    return {
+        "api_key": os.getenv("IBM_API_KEY", "your-api-key"),
+        "project_id": os.getenv("IBM_PROJECT_ID", "your-project-id"),
+        "region": os.getenv("IBM_REGION", "us-south")
+    }
+
+CREDENTIALS = get_api_credentials()
+VERSION = "2023-05-29"
+
+# watsonx rejects random_seed values below 1
+MIN_RANDOM_SEED = 1
+MAX_RANDOM_SEED = 2**32 - 1
+
+# -------------------------------
+# Enhanced Prompt Builder
+# -------------------------------
+def create_enhanced_story_prompt(character_name, story_type, context, writing_style, length_category, mood, setting):
+    """Create a sophisticated prompt for better story generation"""
+    
+    # Define story structure templates
+    story_structures = {
+        "suspense": {
+            "opening": "Create an atmosphere of tension and uncertainty",
+            "development": "Build suspense through pacing, foreshadowing, and mystery",
+            "climax": "Reveal the truth with maximum impact",
+            "resolution": "Provide a satisfying conclusion that ties up loose ends"
+        },
+        "adventure": {
+            "opening": "Establish the quest or journey",
+            "development": "Present challenges and obstacles to overcome",
+            "climax": "Face the greatest challenge or enemy",
+            "resolution": "Achieve the goal and show character growth"
+        },
+        "fantasy": {
+            "opening": "Introduce the magical world and its rules",
+            "development": "Explore magical elements and their consequences",
+            "climax": "Confront the magical threat or complete the quest",
+            "resolution": "Restore balance to the magical world"
+        },
+        "drama": {
+            "opening": "Establish character relationships and conflicts",
+            "development": "Deepen emotional conflicts and character development",
+            "climax": "Face the emotional crisis or life-changing moment",
+            "resolution": "Show character growth and resolution of conflicts"
+        },
+        "mystery": {
+            "opening": "Present the mystery or crime to be solved",
+            "development": "Gather clues and red herrings, build intrigue",
+            "climax": "Reveal the solution and confront the perpetrator",
+            "resolution": "Explain the mystery and show justice served"
+        },
+        "horror": {
+            "opening": "Establish normalcy before introducing the supernatural threat",
+            "development": "Escalate fear through psychological and physical terror",
+            "climax": "Confront the ultimate horror",
+            "resolution": "Survive or succumb to the horror with lasting impact"
+        }
+    }
+    
+    structure = story_structures.get(story_type.lower(), story_structures["adventure"])
+    
+    # Enhanced prompt with better instructions
+    prompt = f"""Write a compelling {story_type.lower()} story with the following requirements:
+
+CHARACTER: {character_name}
+GENRE: {story_type}
+SETTING: {setting}
+MOOD: {mood}
+STYLE: {writing_style}
+LENGTH: {length_category}
+
+CONTEXT AND BACKGROUND:
+{context}
+
+STORY STRUCTURE:
+- Opening: {structure['opening']}
+- Development: {structure['development']}
+- Climax: {structure['climax']}
+- Resolution: {structure['resolution']}
+
+INSTRUCTIONS:
+1. Write a complete, engaging story from beginning to end
+2. Use vivid descriptions and realistic dialogue
+3. Show character development and emotional depth
+4. Create a satisfying narrative arc with proper pacing
+5. Include specific details that bring the story to life
+6. Maintain the chosen mood and writing style throughout
+7. Make sure the story has a clear beginning, middle, and end
+
+Write the complete story now:"""
+
+    return prompt
+
+# -------------------------------
+# Enhanced IBM Watson API Integration
+# -------------------------------
+def get_iam_token(api_key):
+    """Get IBM Cloud IAM token with better error handling"""
+    try:
+        url = "https://iam.cloud.ibm.com/identity/token"
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        data = f"grant_type=urn:ibm:params:oauth:grant-type:apikey&apikey={api_key}"
+        
+        response = requests.post(url, headers=headers, data=data, timeout=30)
+        response.raise_for_status()
+        
+        return response.json().get("access_token")
+    except requests.RequestException as e:
+        logger.error("Authentication error: %s", e)
+        return None
+    except Exception as e:
+        logger.error("Unexpected error during authentication: %s", e)
+        return None
+
+def get_available_models(token, region, project_id):
+    """Check which models are available in your region"""
+    try:
+        url = f"https://{region}.ml.cloud.ibm.com/ml/v4/foundation_model_specs?version=2023-05-29"
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        
+        response = requests.get(url, headers=headers, timeout=30)
+        if response.status_code == 200:
+            data = response.json()
+            if 'resources' in data:
+                available_models = [model['model_id'] for model in data['resources']]
+                return available_models
+        return []
+    except:
+        return []
+
+# Imported modules outlive Streamlit reruns, so one coalescer serves every session
+_GENERATION_COALESCER = SingleFlight()
+
+def get_generation_coalescer():
+    """Single-flight coalescer shared by every session of this server process"""
+    return _GENERATION_COALESCER
+
+def is_deterministic(parameters):
+    """Identical inputs only give identical stories with greedy decoding or a fixed seed"""
+    return parameters.get("decoding_method") == "greedy" or parameters.get("random_seed") is not None
+
+def generate_story_with_watson(prompt, model_id, max_tokens, temperature, creativity_settings):
+    """Enhanced story generation with better parameters and error handling"""
+    # Enhanced parameters for better story generation
+    payload = {
+        "model_id": model_id,
+        "input": prompt,
+        "project_id": CREDENTIALS["project_id"],
+        "parameters": {
+            "temperature": temperature,
+            "max_new_tokens": max_tokens,
+            "min_new_tokens": max(200, max_tokens // 4),
+            "top_k": creativity_settings.get("top_k", 50),
+            "top_p": creativity_settings.get("top_p", 0.9),
+            "decoding_method": creativity_settings.get("decoding_method", "sample"),
+            "repetition_penalty": creativity_settings.get("repetition_penalty", 1.1),
+            "stop_sequences": ["</s>", "<|endoftext|>"],
+            "include_stop_sequence": False
+        }
+    }
+    if creativity_settings.get("random_seed") is not None:
+        payload["parameters"]["random_seed"] = creativity_settings["random_seed"]
+
+    # Sessions submitting the same deterministic request share one upstream call
+    if is_deterministic(payload["parameters"]):
+        key = (CREDENTIALS["region"], json.dumps(payload, sort_keys=True))
+        return get_generation_coalescer().do(key, lambda: request_story_generation(payload))
+    return request_story_generation(payload)
+
+def request_story_generation(payload):
+    """Send a generation payload to IBM Watson and post-process the result"""
+    model_id = payload["model_id"]
+    token = get_iam_token(CREDENTIALS["api_key"])
+    if not token:
+        return "Error: Could not authenticate with IBM Watson. Please check your API credentials."
+
+    try:
+        # Try the new v1 endpoint first
+        url = f"https://{CREDENTIALS['region']}.ml.cloud.ibm.com/ml/v1/text/generation?version={VERSION}"
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        
+        response = requests.post(url, headers=headers, json=payload, timeout=120)
+        
+        # If 404, try alternative endpoint
+        if response.status_code == 404:
+            url = f"https://{CREDENTIALS['region']}.ml.cloud.ibm.com/ml/v4/deployments/{model_id}/text/generation?version={VERSION}"
+            response = requests.post(url, headers=headers, json=payload, timeout=120)
+        
+        response.raise_for_status()
+        
+        data = response.json()
+        if "results" in data and len(data["results"]) > 0:
+            generated_text = data["results"][0]["generated_text"].strip()
+            return post_process_story(generated_text)
+        else:
+            return "Error: No story generated. Please try again with different parameters."
+            
+    except requests.RequestException as e:
+        error_msg = str(e)
+        if "404" in error_msg:
+            return f"Error: Model '{model_id}' not available in region '{CREDENTIALS['region']}'. Please try a different model or check if the model is supported in your region."
+        elif "401" in error_msg:
+            return "Error: Authentication failed. Please check your IBM Watson API credentials."
+        elif "403" in error_msg:
+            return "Error: Access denied. Please check your project permissions and API key."
+        else:
+            return f"Error: Failed to generate story. {error_msg}"
+    except Exception as e:
+        return f"Error: Unexpected error occurred. {str(e)}"
+
+def split_sentences(text):
+    """Split text on periods into stripped, non-empty sentences"""
+    return [s.strip() for s in text.split('.') if s.strip()]
+
+def post_process_story(story):
+    """Clean up and enhance the generated story"""
+    # Remove repetitive sentences
+    sentences = story.split('. ')
+    unique_sentences = []
+    seen_sentences = set()
+    
+    for sentence in sentences:
+        sentence_clean = sentence.strip().lower()
+        if sentence_clean not in seen_sentences and len(sentence_clean) > 10:
+            seen_sentences.add(sentence_clean)
+            unique_sentences.append(sentence.strip())
+    
+    # Rejoin sentences
+    story = '. '.join(unique_sentences)
+    
+    # Fix common formatting issues
+    story = re.sub(r'\s+', ' ', story)  # Multiple spaces
+    story = re.sub(r'\.+', '.', story)  # Multiple periods
+    story = re.sub(r'\?+', '?', story)  # Multiple question marks
+    story = re.sub(r'\!+', '!', story)  # Multiple exclamation marks
+    
+    # Create proper paragraphs (every 3-4 sentences)
+    sentences = split_sentences(story)
+    paragraphs = []
+    current_paragraph = []
+    
+    for i, sentence in enumerate(sentences):
+        current_paragraph.append(sentence)
+        # Create paragraph break every 3-4 sentences or at natural breaks
+        if (len(current_paragraph) >= 3 and 
+            (i == len(sentences) - 1 or 
+             any(word in sentence.lower() for word in ['however', 'meanwhile', 'suddenly', 'later', 'then', 'after']))):
+            paragraphs.append('. '.join(current_paragraph) + '.')
+            current_paragraph = []
+    
+    # Add any remaining sentences
+    if current_paragraph:
+        paragraphs.append('. '.join(current_paragraph) + '.')
+    
+    # Join paragraphs with double line breaks
+    story = '\n\n'.join(paragraphs)
+    
+    return story.strip()
+
+def get_story_statistics(story):
+    """Calculate story statistics"""
+    words = len(story.split())
+    sentences = len([s for s in story.split('.') if s.strip()])
+    paragraphs = len([p for p in story.split('\n\n') if p.strip()])
+    
+    return {
+        "words": words,
+        "sentences": sentences,
+        "paragraphs": paragraphs,
+        "reading_time": max(1, words // 200)  # Average reading speed
+    }
@@ -0,0 +1,247 @@
+import argparse
+import gzip
+import hashlib
+import html
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import unicodedata
+import zipfile
+from datetime import datetime, timezone
+
+# -------------------------------
+# Story Records
+# -------------------------------
+STORY_FIELDS = ["id", "title", "character", "genre", "setting", "mood", "style", "model_id", "created_at", "story"]
+
+def make_story_record(story, character_name, story_type, setting, mood, writing_style, model_id):
+    """Bundle a generated story with the inputs that produced it"""
+    return {
+        "id": hashlib.sha1(story.encode("utf-8")).hexdigest()[:12],
+        "title": f"{character_name.strip()}: A {story_type} Story",
+        "character": character_name.strip(),
+        "genre": story_type,
+        "setting": setting,
+        "mood": mood,
+        "style": writing_style,
+        "model_id": model_id,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "story": story,
+    }
+
+def safe_filename(*parts, extension):
+    """Build a portable file name from user-supplied parts"""
+    stem = "_".join(part for part in parts if part)
+    stem = unicodedata.normalize("NFKD", stem).encode("ascii", "ignore").decode("ascii")
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", stem).strip("._-")
+    stem = re.sub(r"_+", "_", stem)[:80] or "story"
+    return f"{stem}.{extension}"
+
+def iter_jsonl(path):
+    """Read story records one at a time from a .jsonl or .jsonl.gz file"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# -------------------------------
+# Streaming Writers
+# -------------------------------
+# Every writer consumes an iterable of records and writes each one before
+# reading the next, so memory use does not grow with the size of the corpus.
+
+def write_text(stories, fileobj):
+    """Write stories as plain text separated by their titles"""
+    for index, record in enumerate(stories):
+        if index:
+            fileobj.write(b"\n\n")
+        fileobj.write(f"{record['title']}\n\n{record['story'].strip()}\n".encode("utf-8"))
+
+def write_markdown(stories, fileobj):
+    """Write stories as Markdown sections to a binary file object"""
+    for index, record in enumerate(stories):
+        if index:
+            fileobj.write(b"\n---\n\n")
+        details = " | ".join(
+            f"**{label}:** {record[field]}"
+            for label, field in [("Genre", "genre"), ("Setting", "setting"), ("Mood", "mood"), ("Style", "style")]
+            if record.get(field)
+        )
+        section = f"# {record['title']}\n\n"
+        if details:
+            section += f"{details}\n\n"
+        section += f"{record['story'].strip()}\n"
+        fileobj.write(section.encode("utf-8"))
+
+EPUB_CONTAINER = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+EPUB_CHAPTER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head><title>{title}</title></head>
+<body>
+<h1>{title}</h1>
+{paragraphs}
+</body>
+</html>
+"""
+
+def write_epub(stories, fileobj, title="GenAI Stories"):
+    """Write stories as chapters of an EPUB 3 book to a binary file object.
+
+    Chapters are compressed into the archive as they arrive; only their
+    titles are kept for the table of contents written at the end.
+    """
+    # EPUB 3 requires at least one spine item; check before writing anything
+    stories = iter(stories)
+    first = next(stories, None)
+    if first is None:
+        raise ValueError("Cannot export an empty corpus to EPUB")
+    stories = itertools.chain([first], stories)
+
+    chapters = []
+    book_id = hashlib.sha1()
+    with zipfile.ZipFile(fileobj, "w") as book:
+        # The mimetype entry must come first and be stored uncompressed
+        book.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        book.writestr("META-INF/container.xml", EPUB_CONTAINER, compress_type=zipfile.ZIP_DEFLATED)
+
+        for index, record in enumerate(stories, start=1):
+            name = f"chapter_{index:05d}.xhtml"
+            paragraphs = "\n".join(
+                f"<p>{html.escape(paragraph.strip())}</p>"
+                for paragraph in str(record["story"]).split("\n\n") if paragraph.strip()
+            )
+            chapter_title = str(record["title"])
+            chapter = EPUB_CHAPTER.format(title=html.escape(chapter_title), paragraphs=paragraphs)
+            book.writestr(f"OEBPS/{name}", chapter, compress_type=zipfile.ZIP_DEFLATED)
+            chapters.append((name, chapter_title))
+            book_id.update(str(record.get("id", name)).encode("utf-8"))
+
+        nav_items = "\n".join(
+            f'      <li><a href="{name}">{html.escape(chapter_title)}</a></li>' for name, chapter_title in chapters
+        )
+        nav = f"""<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head><title>{html.escape(title)}</title></head>
+<body>
+  <nav epub:type="toc">
+    <ol>
+{nav_items}
+    </ol>
+  </nav>
+</body>
+</html>
+"""
+        book.writestr("OEBPS/nav.xhtml", nav, compress_type=zipfile.ZIP_DEFLATED)
+
+        manifest = "\n".join(
+            f'    <item id="c{index}" href="{name}" media-type="application/xhtml+xml"/>'
+            for index, (name, _) in enumerate(chapters, start=1)
+        )
+        spine = "\n".join(f'    <itemref idref="c{index}"/>' for index in range(1, len(chapters) + 1))
+        modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        opf = f"""<?xml version="1.0" encoding="UTF-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">urn:sha1:{book_id.hexdigest()}</dc:identifier>
+    <dc:title>{html.escape(title)}</dc:title>
+    <dc:language>en</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+{manifest}
+  </manifest>
+  <spine>
+{spine}
+  </spine>
+</package>
+"""
+        book.writestr("OEBPS/content.opf", opf, compress_type=zipfile.ZIP_DEFLATED)
+
+def write_jsonl_gz(stories, fileobj):
+    """Write one gzip-compressed JSON record per line to a binary file object"""
+    with gzip.GzipFile(fileobj=fileobj, mode="wb") as out:
+        for record in stories:
+            out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+def write_parquet(stories, fileobj, batch_size=1000):
+    """Write stories to a zstd-compressed Parquet file, one row group per batch"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+
+    schema = pa.schema([(field, pa.string()) for field in STORY_FIELDS])
+    with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+        batch = []
+        for record in stories:
+            # Corpora read from JSONL may hold numbers or other non-string values
+            batch.append({field: None if record.get(field) is None else str(record[field]) for field in STORY_FIELDS})
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+def parquet_available():
+    """Parquet export is optional and needs pyarrow"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+EXPORT_FORMATS = {
+    "text": {"label": "Text", "extension": "txt", "mime": "text/plain", "writer": write_text},
+    "markdown": {"label": "Markdown", "extension": "md", "mime": "text/markdown", "writer": write_markdown},
+    "epub": {"label": "EPUB", "extension": "epub", "mime": "application/epub+zip", "writer": write_epub},
+    "jsonl": {"label": "JSONL (gzip)", "extension": "jsonl.gz", "mime": "application/gzip", "writer": write_jsonl_gz},
+    "parquet": {"label": "Parquet", "extension": "parquet", "mime": "application/vnd.apache.parquet",
+                "writer": write_parquet},
+}
+
+# -------------------------------
+# Export Entry Points
+# -------------------------------
+def export_corpus(stories, fmt, fileobj):
+    """Stream any iterable of story records to fileobj in the given format"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+    EXPORT_FORMATS[fmt]["writer"](stories, fileobj)
+
+def export_bytes(stories, fmt):
+    """Render story records to an in-memory file, for downloads"""
+    buffer = io.BytesIO()
+    export_corpus(stories, fmt, buffer)
+    return buffer.getvalue()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a JSONL story corpus to another format")
+    parser.add_argument("corpus", help="Input .jsonl or .jsonl.gz file with one story record per line")
+    parser.add_argument("output", help="Output file")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.output, "wb") as out:
+            export_corpus(iter_jsonl(args.corpus), args.format, out)
+    except ValueError as e:
+        os.remove(args.output)
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "watsonx"
+
+sys.path.insert(0, str(ROOT))
+
+import story_engine  # noqa: E402
+
+IAM_URL = "https://iam.cloud.ibm.com/identity/token"
+
+
+def load_fixture(name):
+    with open(FIXTURES / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_response(url, recorded):
+    """Build a real requests.Response so raise_for_status behaves as in production"""
+    response = requests.Response()
+    response.url = url
+    response.status_code = recorded["status_code"]
+    response._content = json.dumps(recorded["body"]).encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+    response.reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+                       404: "Not Found", 500: "Internal Server Error"}[recorded["status_code"]]
+    return response
+
+
+class RecordedWatsonx:
+    """Replays recorded IAM and text-generation responses in order"""
+
+    def __init__(self, generation, iam="iam_token"):
+        self.iam = load_fixture(iam)
+        self.generation = list(load_fixture(generation))
+        self.calls = []
+
+    def post(self, url, headers=None, data=None, json=None, timeout=None):
+        self.calls.append({"url": url, "headers": headers, "data": data, "json": json})
+        if url == IAM_URL:
+            return make_response(url, self.iam)
+        if not self.generation:
+            raise AssertionError(f"Unexpected request to {url}")
+        return make_response(url, self.generation.pop(0))
+
+    @property
+    def generation_calls(self):
+        return [call for call in self.calls if call["url"] != IAM_URL]
+
+
+@pytest.fixture
+def credentials(monkeypatch):
+    creds = {"api_key": "test-api-key", "project_id": "test-project", "region": "us-south"}
+    monkeypatch.setattr(story_engine, "CREDENTIALS", creds)
+    return creds
+
+
+@pytest.fixture
+def watsonx(monkeypatch, credentials):
+    """Install a recorded watsonx backend: watsonx("generation_success")"""
+    def install(generation, iam="iam_token"):
+        backend = RecordedWatsonx(generation, iam)
+        monkeypatch.setattr(story_engine.requests, "post", backend.post)
+        return backend
+    return install
+
+
+@pytest.fixture
+def perf_budget():
+    """Scale performance budgets on slow machines with PERF_BUDGET_SCALE"""
+    scale = float(os.getenv("PERF_BUDGET_SCALE", "1.0"))
+    return lambda seconds: seconds * scale
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from coalescing import SingleFlight
+
+
+def run_concurrently(flight, key, fn, count):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_requests(flight, count):
+    deadline = time.monotonic() + 5
+    while flight.stats()["requests"] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert flight.stats()["requests"] >= count
+
+
+def test_sequential_calls_are_not_cached():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["upstream_calls"] == 2
+    assert flight.stats()["calls_saved"] == 0
+
+
+def test_concurrent_waiters_share_result_and_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("upstream failed")
+
+    threads, results, errors = run_concurrently(flight, "key", failing, 5)
+    wait_for_requests(flight, 5)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == []
+    assert len(errors) == 5 and all(str(e) == "upstream failed" for e in errors)
+    stats = flight.stats()
+    assert stats["upstream_calls"] == 1
+    assert stats["calls_saved"] == 4
+    assert stats["in_flight"] == 0
+    assert stats["saved_ratio"] == pytest.approx(0.8)
+
+
+def test_different_keys_do_not_share():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    assert flight.stats()["calls_saved"] == 0
+
+
+def test_leader_control_flow_exception_is_not_shared():
+    """Streamlit's rerun exception derives from BaseException and must stay in the leader"""
+    class RerunException(BaseException):
+        pass
+
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def interrupted():
+        started.set()
+        release.wait(5)
+        raise RerunException()
+
+    leader_errors = []
+
+    def leader():
+        try:
+            flight.do("key", interrupted)
+        except RerunException as e:
+            leader_errors.append(e)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait(5)
+    threads, results, errors = run_concurrently(flight, "key", lambda: "fresh story", 3)
+    wait_for_requests(flight, 4)
+    release.set()
+    leader_thread.join(timeout=5)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(leader_errors) == 1
+    assert errors == []
+    assert results == ["fresh story"] * 3
+
+
+def test_each_caller_raises_its_own_exception_object():
+    flight = SingleFlight()
+    release = threading.Event()
+    original = []
+
+    def failing():
+        release.wait(5)
+        error = ValueError("upstream failed")
+        original.append(error)
+        raise error
+
+    threads, results, errors = run_concurrently(flight, "key", failing, 5)
+    wait_for_requests(flight, 5)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 5
+    assert len({id(e) for e in errors}) == 5
+    assert all(type(e) is ValueError and str(e) == "upstream failed" for e in errors)
+    waiter_errors = [e for e in errors if e is not original[0]]
+    assert len(waiter_errors) == 4
+    assert all(e.__cause__ is original[0] for e in waiter_errors)
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from story_engine import create_enhanced_story_prompt, get_story_statistics, post_process_story, split_sentences
+
+pytestmark = pytest.mark.perf
+
+SENTENCE_TEMPLATES = [
+    "Alex walked through chamber {i} of the flooded archive",
+    "However, the lantern in room {i} flickered and went dark",
+    "Somewhere above, door {i} creaked open on rusted hinges",
+    "The map showed a corridor numbered {i} that nobody remembered",
+]
+
+
+def long_story(sentence_count):
+    # Every fifth sentence repeats an earlier one so deduplication has work to do
+    sentences = [SENTENCE_TEMPLATES[i % 4].format(i=i - (i % 5 == 0) * 3) for i in range(sentence_count)]
+    return ". ".join(sentences) + "..."
+
+
+def best_of(fn, repeat=5):
+    """Best wall time of several runs, to keep budgets stable on noisy machines"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# A 1500-token story is roughly 80 sentences; these inputs are far larger
+# so that an accidental quadratic step blows the budget.
+def test_post_process_story_budget(perf_budget):
+    story = long_story(5000)
+    assert best_of(lambda: post_process_story(story)) < perf_budget(0.25)
+
+
+def test_post_process_story_scales_linearly():
+    small, large = long_story(2000), long_story(16000)
+    ratio = best_of(lambda: post_process_story(large)) / best_of(lambda: post_process_story(small))
+    assert ratio < 16
+
+
+def test_split_sentences_budget(perf_budget):
+    story = long_story(20000)
+    assert best_of(lambda: split_sentences(story)) < perf_budget(0.04)
+
+
+def test_get_story_statistics_budget(perf_budget):
+    story = post_process_story(long_story(5000))
+    assert best_of(lambda: get_story_statistics(story)) < perf_budget(0.02)
+
+
+def test_create_enhanced_story_prompt_budget(perf_budget):
+    context = "The archive flooded during the storm. " * 200
+
+    def build_many():
+        for _ in range(1000):
+            create_enhanced_story_prompt(
+                "Alex", "Mystery", context, "Narrative", "Long (800-1200 words)", "Eerie", "Small Town"
+            )
+
+    assert best_of(build_many) < perf_budget(0.05)
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+import story_engine
+from story_engine import create_enhanced_story_prompt, generate_story_with_watson
+
+SETTINGS = {"top_k": 40, "top_p": 0.85, "repetition_penalty": 1.1}
+
+
+def generate(model_id="ibm/granite-3-3-8b-instruct", **overrides):
+    return generate_story_with_watson("Write a story", model_id, 600, 0.7, {**SETTINGS, **overrides})
+
+
+# -------------------------------
+# Prompt Builder
+# -------------------------------
+def test_prompt_includes_story_details():
+    prompt = create_enhanced_story_prompt(
+        "Alex", "Mystery", "A stolen painting", "Narrative", "Short (300-500 words)", "Eerie", "Small Town"
+    )
+    assert "CHARACTER: Alex" in prompt
+    assert "SETTING: Small Town" in prompt
+    assert "A stolen painting" in prompt
+    assert "Present the mystery or crime to be solved" in prompt
+    assert prompt.endswith("Write the complete story now:")
+
+
+def test_prompt_falls_back_to_adventure_structure():
+    prompt = create_enhanced_story_prompt("Alex", "Romance", "", "Literary", "Long", "Romantic", "Forest")
+    assert "Establish the quest or journey" in prompt
+
+
+# -------------------------------
+# Response Parsing
+# -------------------------------
+def test_success_is_post_processed(watsonx):
+    backend = watsonx("generation_success")
+    story = generate()
+
+    assert story.startswith("The lighthouse had been dark for eleven years")
+    assert story.count("The lighthouse had been dark") == 1
+    assert "\n\n" in story
+    [call] = backend.generation_calls
+    assert "/ml/v1/text/generation" in call["url"]
+    assert call["headers"]["Authorization"] == "Bearer recorded-access-token"
+    assert call["json"]["project_id"] == "test-project"
+    assert call["json"]["parameters"]["decoding_method"] == "sample"
+    assert call["json"]["parameters"]["min_new_tokens"] == 200
+    assert "random_seed" not in call["json"]["parameters"]
+
+
+def test_404_falls_back_to_deployment_endpoint(watsonx):
+    backend = watsonx("generation_404_fallback")
+    story = generate("meta-llama/llama-3-405b-instruct")
+
+    assert story.startswith("Mira found the map")
+    first, second = backend.generation_calls
+    assert "/ml/v1/text/generation" in first["url"]
+    assert "/ml/v4/deployments/meta-llama/llama-3-405b-instruct/text/generation" in second["url"]
+
+
+def test_404_on_both_endpoints_reports_unavailable_model(watsonx):
+    watsonx("generation_404_both")
+    story = generate("core42/jais-13b-chat")
+    assert story == (
+        "Error: Model 'core42/jais-13b-chat' not available in region 'us-south'. "
+        "Please try a different model or check if the model is supported in your region."
+    )
+
+
+@pytest.mark.parametrize("fixture", ["generation_empty_results", "generation_missing_results"])
+def test_no_results_reports_no_story(watsonx, fixture):
+    watsonx(fixture)
+    assert generate() == "Error: No story generated. Please try again with different parameters."
+
+
+@pytest.mark.parametrize("fixture, message", [
+    ("generation_401", "Error: Authentication failed. Please check your IBM Watson API credentials."),
+    ("generation_403", "Error: Access denied. Please check your project permissions and API key."),
+])
+def test_http_errors_are_explained(watsonx, fixture, message):
+    watsonx(fixture)
+    assert generate() == message
+
+
+def test_server_error_includes_details(watsonx):
+    watsonx("generation_500")
+    story = generate()
+    assert story.startswith("Error: Failed to generate story. 500 Server Error")
+
+
+def test_failed_authentication_skips_generation(watsonx):
+    backend = watsonx("generation_success", iam="iam_invalid_api_key")
+    story = generate()
+    assert story == "Error: Could not authenticate with IBM Watson. Please check your API credentials."
+    assert backend.generation_calls == []
+
+
+# -------------------------------
+# Request Coalescing
+# -------------------------------
+@pytest.mark.parametrize("seed", [story_engine.MIN_RANDOM_SEED, 42, story_engine.MAX_RANDOM_SEED])
+def test_fixed_seed_is_sent_upstream(watsonx, seed):
+    backend = watsonx("generation_success")
+    assert not generate(random_seed=seed).startswith("Error")
+    [call] = backend.generation_calls
+    assert call["json"]["parameters"]["random_seed"] == seed
+
+
+def test_identical_deterministic_requests_share_one_call(watsonx, monkeypatch):
+    coalescer = story_engine.SingleFlight()
+    monkeypatch.setattr(story_engine, "_GENERATION_COALESCER", coalescer)
+    release = threading.Event()
+    calls = []
+
+    def slow_request(payload):
+        calls.append(payload)
+        release.wait(5)
+        return "shared story"
+
+    monkeypatch.setattr(story_engine, "request_story_generation", slow_request)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(generate(random_seed=7))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while coalescer.stats()["requests"] < len(threads) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert coalescer.stats()["requests"] == len(threads)
+
+    assert results == ["shared story"] * 8
+    assert len(calls) == 1
+    assert coalescer.stats()["calls_saved"] == 7
+
+
+def test_sampled_requests_are_not_coalesced(watsonx, monkeypatch):
+    coalescer = story_engine.SingleFlight()
+    monkeypatch.setattr(story_engine, "_GENERATION_COALESCER", coalescer)
+    monkeypatch.setattr(story_engine, "request_story_generation", lambda payload: "story")
+    generate()
+    assert coalescer.stats()["requests"] == 0
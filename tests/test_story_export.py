@@ -0,0 +1,132 @@
+import gzip
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from story_export import (
+    EXPORT_FORMATS,
+    export_bytes,
+    export_corpus,
+    main,
+    make_story_record,
+    safe_filename,
+    write_epub,
+    write_jsonl_gz,
+)
+
+STORY = "The lighthouse had been dark for eleven years. Alex climbed the stairs.\n\nThe lamp began to <turn> & glow."
+
+
+def record(index=0):
+    return make_story_record(f"{STORY} ({index})", "Alex", "Mystery", "Small Town", "Eerie", "Narrative",
+                             "ibm/granite-3-3-8b-instruct")
+
+
+def corpus(count):
+    return (record(i) for i in range(count))
+
+
+@pytest.mark.parametrize("parts, expected", [
+    (["Alex", "Mystery", "Small Town"], "Alex_Mystery_Small_Town.md"),
+    (["../../etc/passwd"], "etc_passwd.md"),
+    (["Zoë <script>", "Fantasy"], "Zoe_script_Fantasy.md"),
+    (["", "   "], "story.md"),
+])
+def test_safe_filename(parts, expected):
+    assert safe_filename(*parts, extension="md") == expected
+
+
+def test_markdown_export():
+    text = export_bytes([record(0), record(1)], "markdown").decode("utf-8")
+    assert text.startswith("# Alex: A Mystery Story\n\n**Genre:** Mystery | **Setting:** Small Town")
+    assert text.count("\n---\n") == 1
+    assert "The lamp began to <turn> & glow. (1)" in text
+
+
+def test_epub_export_is_a_valid_package():
+    book = zipfile.ZipFile(io.BytesIO(export_bytes(list(corpus(3)), "epub")))
+    first = book.infolist()[0]
+    assert first.filename == "mimetype" and first.compress_type == zipfile.ZIP_STORED
+    assert book.read("mimetype") == b"application/epub+zip"
+    assert "OEBPS/content.opf" in book.read("META-INF/container.xml").decode()
+
+    opf = book.read("OEBPS/content.opf").decode()
+    assert opf.count("<itemref ") == 3
+    chapter = book.read("OEBPS/chapter_00001.xhtml").decode()
+    assert "<p>The lamp began to &lt;turn&gt; &amp; glow. (0)</p>" in chapter
+    assert "chapter_00003.xhtml" in book.read("OEBPS/nav.xhtml").decode()
+
+
+def test_jsonl_export_round_trips():
+    records = list(corpus(3))
+    lines = gzip.decompress(export_bytes(records, "jsonl")).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_parquet_export_round_trips():
+    pq = pytest.importorskip("pyarrow.parquet")
+    buffer = io.BytesIO()
+    EXPORT_FORMATS["parquet"]["writer"](corpus(25), buffer, batch_size=10)
+    parquet = pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.num_rows == 25
+    assert table.column("story")[24].as_py().endswith("(24)")
+
+
+@pytest.mark.parametrize("writer", [write_jsonl_gz, write_epub])
+def test_writers_stream_records(writer):
+    """Output must be written while the corpus is consumed, not buffered to the end"""
+    buffer = io.BytesIO()
+    sizes = []
+
+    def tracked_corpus():
+        for i in range(200):
+            sizes.append(buffer.tell())
+            yield make_story_record(os.urandom(4096).hex(), "Alex", "Drama", "Forest", "Melancholic",
+                                    "Literary", "ibm/granite-3-8b-instruct")
+
+    writer(tracked_corpus(), buffer)
+    assert sizes[-1] > sizes[len(sizes) // 2] > sizes[0]
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_corpus([record()], "docx", io.BytesIO())
+
+
+def test_epub_export_rejects_empty_corpus():
+    buffer = io.BytesIO()
+    with pytest.raises(ValueError, match="empty corpus"):
+        write_epub([], buffer)
+    assert buffer.getvalue() == b""
+
+
+def test_cli_removes_output_for_empty_epub(tmp_path):
+    corpus_path = tmp_path / "empty.jsonl"
+    corpus_path.write_text("")
+    output = tmp_path / "out.epub"
+    with pytest.raises(SystemExit):
+        main([str(corpus_path), str(output), "--format", "epub"])
+    assert not output.exists()
+
+
+NON_STRING_RECORD = {"id": 5, "title": 2024, "character": "Alex", "genre": "Drama", "setting": None,
+                     "mood": "Eerie", "style": "Literary", "model_id": "m", "created_at": 1735689600,
+                     "story": 42}
+
+
+def test_epub_export_accepts_non_string_fields():
+    book = zipfile.ZipFile(io.BytesIO(export_bytes([NON_STRING_RECORD], "epub")))
+    chapter = book.read("OEBPS/chapter_00001.xhtml").decode()
+    assert "<h1>2024</h1>" in chapter and "<p>42</p>" in chapter
+
+
+def test_parquet_export_accepts_non_string_fields():
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(io.BytesIO(export_bytes([NON_STRING_RECORD], "parquet")))
+    row = table.to_pylist()[0]
+    assert row["id"] == "5" and row["created_at"] == "1735689600" and row["setting"] is None